@@ -38,6 +38,7 @@ setup(
         "richdem": ["richdem"],
         "opencv": ["opencv"],
         "pytransform3d": ["pytransform3d"],
+        "numba": ["numba"],
     },
     python_requires=">=3.7",
     scripts=[],
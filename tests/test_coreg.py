@@ -152,6 +152,14 @@ class TestCoregClass:
         dem3 = dem1 + np.random.random(size=dem1.size).reshape(dem1.shape)
         assert abs(biascorr.error(dem1, dem3, transform=affine, error_type="std") - np.std(dem3)) < 1e-6
 
+        # Masked values should be excluded, and the residuals should be a regular ndarray.
+        dem4 = np.ma.masked_array(dem2.copy(), mask=np.zeros_like(dem2, dtype=bool))
+        dem4.mask[:10] = True
+        residuals = biascorr.residuals(dem1, dem4, transform=affine)
+        assert not isinstance(residuals, np.ma.masked_array)
+        assert residuals.size == dem1.size - dem1[:10].size
+        assert biascorr.error(dem1, dem4, transform=affine, error_type="median") == -2
+
 
 
 
@@ -255,6 +263,14 @@ class TestCoregClass:
 
         assert aligned_dem.shape == self.ref.data.squeeze().shape
 
+        # An empty pipeline should return a copy of the DEM, and not a view of it.
+        dem = np.ones((50, 50), dtype=float)
+        empty_pipeline = coreg.CoregPipeline([])
+        empty_pipeline.fit(dem, dem)
+        unchanged_dem = empty_pipeline.apply(dem, rio.transform.from_origin(0, 0, 1, 1))
+        assert np.array_equal(unchanged_dem, dem)
+        assert not np.shares_memory(unchanged_dem, dem)
+
         # Make a new pipeline with two bias correction approaches.
         pipeline2 = coreg.CoregPipeline([coreg.BiasCorr(), coreg.BiasCorr()])
         # Set both "estimated" biases to be 1
@@ -295,7 +311,7 @@ class TestCoregClass:
         bias5 = bias3 + bias3
         assert bias5.to_matrix()[2, 3] == bias * 4
 
-    def test_subsample(self):
+    def test_subsample_bias(self):
         warnings.simplefilter("error")
 
         # Test subsampled bias correction
@@ -315,6 +331,9 @@ class TestCoregClass:
         # Check that the estimated biases are similar
         assert abs(bias_sub._meta["bias"] - bias_full._meta["bias"]) < 0.1
 
+    def test_subsample_icp(self):
+        warnings.simplefilter("error")
+
         # Test ICP with subsampling
         icp_full = coreg.ICP(max_iterations=20)
         icp_sub = coreg.ICP(max_iterations=20)
@@ -519,3 +538,68 @@ class TestCoregClass:
         unscaled_dem = zcorr_nonlinear.apply(scaled_dem, None)
         diff = (dem_with_nans - unscaled_dem).filled(np.nan)
         assert np.abs(np.nanmedian(diff)) < 0.05
+
+
+@pytest.mark.parametrize("use_numba", [False, True])  # type: ignore
+@pytest.mark.parametrize("dtype", ["float32", "float64"])  # type: ignore
+def test_calculate_slope_and_aspect(dtype: str, use_numba: bool, monkeypatch: Any):
+    """Test that the slope and aspect are equivalent to their np.gradient definitions, with and without numba."""
+    warnings.simplefilter("error")
+    if use_numba and not coreg._has_numba:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(coreg, "_has_numba", use_numba)
+
+    dem = np.cumsum(np.random.normal(size=(100, 120)), axis=1).astype(dtype)
+    dem[[10, 50, 99], [0, 60, 119]] = np.nan
+
+    slope, aspect = coreg.calculate_slope_and_aspect(dem)
+
+    gradient_y, gradient_x = np.gradient(dem)
+    assert slope.shape == aspect.shape == dem.shape
+    assert slope.dtype == aspect.dtype == dem.dtype
+    # The numba kernel adds pi in double precision, so float32 aspects near 0 can differ by more than the rtol.
+    assert np.allclose(slope, np.sqrt(gradient_x ** 2 + gradient_y ** 2), rtol=1e-5, atol=1e-6, equal_nan=True)
+    assert np.allclose(aspect, np.arctan2(-gradient_x, gradient_y) + np.pi, rtol=1e-5, atol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("dtype", ["int16", "float32"])  # type: ignore
+def test_apply_z_shift(dtype: str):
+    """Test that the block-wise vertical shift equals shifting the whole DEM at once."""
+    warnings.simplefilter("error")
+
+    # A shape that is not a multiple of the block size, to include partial blocks at the edges.
+    dem = (np.random.normal(size=(70, 50)) * 100).astype(dtype)
+    dz = 5.5
+
+    temp_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(temp_dir.name, "dem.tif")
+    with rio.open(path, "w", driver="GTiff", height=dem.shape[0], width=dem.shape[1], count=1, dtype=dtype,
+                  crs="EPSG:32633", transform=rio.transform.from_origin(0, 0, 20, 20),
+                  tiled=True, blockxsize=16, blockysize=16) as raster:
+        raster.write(dem, 1)
+
+    shifted = coreg.apply_z_shift(path, dz)
+    with rio.open(path) as raster:
+        expected = raster.read(1) + dz
+
+    assert shifted.dtype == expected.dtype
+    assert np.array_equal(shifted, expected)
+
+
+def test_filtered_slope(capsys: Any):
+    """Test that the slope filter only masks values outside of the limits, and skips limits covering 0-90."""
+    warnings.simplefilter("error")
+
+    slope = np.ma.masked_array(np.linspace(0, 90, 91))
+
+    # Limits covering all possible slopes return the input as is.
+    unfiltered = coreg.filtered_slope(slope, slope_lim=(0, 90))
+    assert unfiltered is slope
+    assert capsys.readouterr().out.splitlines()[-1] == "91"
+
+    filtered = coreg.filtered_slope(slope, slope_lim=(10, 40))
+    assert filtered.count() == 31
+    assert filtered.min() == 10 and filtered.max() == 40
+    assert capsys.readouterr().out.splitlines()[-1] == "31"
+    # The input should not have been masked.
+    assert slope.count() == 91
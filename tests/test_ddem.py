@@ -3,6 +3,8 @@ import warnings
 
 import geoutils as gu
 import numpy as np
+import pandas as pd
+import shapely.geometry
 
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
@@ -91,3 +93,52 @@ class TestdDEM:
             mask=self.outlines_1990
         )
         assert np.abs(np.mean(self.ddem.data - ddem.filled_data)) < 1
+
+    def test_local_hypso_overlapping_features(self):
+        """Test that the local hypsometric approach handles overlapping features like per-feature masks would."""
+        ddem = self.ddem.copy()
+        ddem.data.mask = np.zeros_like(ddem.data, dtype=bool)
+        ddem.data.mask.ravel()[np.random.choice(ddem.data.size, 50000, replace=False)] = True
+
+        # Create two overlapping features: Scott Turnerbreen and a buffered version of it.
+        scott_1990 = self.outlines_1990.query("NAME == 'Scott Turnerbreen'").ds
+        overlapping = gu.Vector(pd.concat(
+            [scott_1990, scott_1990.assign(geometry=scott_1990.buffer(200))], ignore_index=True
+        ))
+
+        ddem.interpolate(
+            method="local_hypsometric",
+            reference_elevation=self.dem_2009.data,
+            mask=overlapping
+        )
+
+        # Interpolate each feature in turn, using a mask created for each feature separately.
+        interpolated_ddem, nans = xdem.spatial_tools.get_array_and_mask(ddem.data.copy())
+        ddem_mask = nans.copy()
+        for i in overlapping.ds.index:
+            feature_mask = gu.Vector(overlapping.ds.loc[[i]]).create_mask(ddem).reshape(interpolated_ddem.shape)
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", "Not enough valid bins")
+                interpolated_ddem = np.asarray(xdem.volume.hypsometric_interpolation(
+                    interpolated_ddem, self.dem_2009.data.data, mask=feature_mask
+                ))
+            ddem_mask[feature_mask] = False
+            interpolated_ddem[ddem_mask] = np.nan
+        expected = xdem.volume.linear_interpolation(interpolated_ddem)
+
+        assert np.allclose(ddem.filled_data, expected, equal_nan=True)
+
+    def test_feature_masks(self):
+        """Test that the feature masks used by the local hypsometric approach equal masks created per feature."""
+        outlines = self.outlines_1990.ds[self.outlines_1990.ds.intersects(shapely.geometry.box(*self.ddem.bounds))]
+        # Add a buffered copy of Scott Turnerbreen, which overlaps with it (and maybe with its neighbours).
+        scott_1990 = outlines[outlines["NAME"] == "Scott Turnerbreen"]
+        with_overlaps = pd.concat([outlines, scott_1990.assign(geometry=scott_1990.buffer(200))], ignore_index=True)
+
+        for features in [outlines, with_overlaps]:
+            masks = list(self.ddem._feature_masks(features))
+            assert len(masks) == features.shape[0]
+
+            for index, mask in zip(features.index, masks):
+                expected = gu.Vector(features.loc[[index]]).create_mask(self.ddem).reshape(mask.shape)
+                assert np.array_equal(mask, expected)
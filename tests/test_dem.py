@@ -59,9 +59,9 @@ class TestDEM:
                                       np.array_equal(dem2.data, dem3.data, equal_nan=True),
                                       np.array_equal(dem3.data, dem4.data, equal_nan=True)))
 
-        assert np.logical_and.reduce((np.all(dem.data.mask == dem2.data.mask),
-                                      np.all(dem2.data.mask == dem3.data.mask),
-                                      np.all(dem3.data.mask == dem4.data.mask)))
+        assert np.logical_and.reduce((np.array_equal(dem.data.mask, dem2.data.mask),
+                                      np.array_equal(dem2.data.mask, dem3.data.mask),
+                                      np.array_equal(dem3.data.mask, dem4.data.mask)))
 
     def test_copy(self):
         """
@@ -96,7 +96,7 @@ class TestDEM:
         assert np.array_equal(r.data, r2.data, equal_nan=True)
 
         # Check dataset_mask array
-        assert np.all(r.data.mask == r2.data.mask)
+        assert np.array_equal(r.data.mask, r2.data.mask)
 
         # Check that if r.data is modified, it does not affect r2.data
         r.data += 5
@@ -56,6 +56,23 @@ class TestDEMCollection:
         # The 1990-2009 area should be the union of those years. The 2009-2060 area should just be the 2010 area.
         assert dh_series.iloc[0]["area"] > dh_series.iloc[-1]["area"]
 
+        # The outlines should only be rasterized once for each filter, and the cached masks should stay the same.
+        scott_mask = dems.get_ddem_mask(dems.ddems[0], outlines_filter=scott_filter)
+        cache_size = len(dems._outline_masks)
+        assert np.array_equal(scott_mask, dems.get_ddem_mask(dems.ddems[0], outlines_filter=scott_filter))
+        assert len(dems._outline_masks) == cache_size
+        assert np.count_nonzero(scott_mask) < np.count_nonzero(dems.get_ddem_mask(dems.ddems[0]))
+
+        # Replacing the outlines should invalidate the cached masks.
+        outlines_timestamp = list(dems.outlines.keys())[0]
+        original_outlines = dems.outlines[outlines_timestamp]
+        dems.outlines[outlines_timestamp] = gu.Vector(original_outlines.ds.query(scott_filter))
+        assert not np.array_equal(
+            dems._rasterize_outlines(outlines_timestamp, dems.ddems[0]),
+            original_outlines.create_mask(dems.ddems[0])
+        )
+        dems.outlines[outlines_timestamp] = original_outlines
+
         cumulative_dh = dems.get_cumulative_series(kind="dh", outlines_filter=scott_filter)
         cumulative_dv = dems.get_cumulative_series(kind="dv", outlines_filter=scott_filter)
 
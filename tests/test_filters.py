@@ -87,7 +87,8 @@ class TestFilters:
 
         # Assert that non filtered pixels remain the same
         assert ddem.data.shape == filtered_ddem.shape        
-        assert np.all(ddem.data[np.isfinite(filtered_ddem)] == filtered_ddem[np.isfinite(filtered_ddem)])
+        finite_mask = np.isfinite(filtered_ddem)
+        assert np.array_equal(ddem.data[finite_mask], filtered_ddem[finite_mask])
 
         # Check that it works with NaNs too
         ddem.data[0, rows[:500], cols[:500]] = np.nan
@@ -0,0 +1,43 @@
+"""Functions to test the lazy imports of the xdem package."""
+import subprocess
+import sys
+
+
+def run_in_fresh_interpreter(code: str) -> None:
+    """Run the code in a new Python process, so that no xdem module has been imported beforehand."""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_submodules_are_imported_lazily():
+    """Test that submodules are only imported when they are first accessed."""
+    run_in_fresh_interpreter("""
+import sys
+import xdem
+
+assert "xdem.spstats" not in sys.modules
+assert "xdem.volume" not in sys.modules
+
+xdem.spstats
+assert "xdem.spstats" in sys.modules
+assert "xdem.volume" not in sys.modules
+""")
+
+
+def test_lazy_attributes():
+    """Test that the lazily imported submodules and classes behave like regular imports."""
+    run_in_fresh_interpreter("""
+import xdem
+import xdem.dem
+from xdem import coreg
+
+assert xdem.DEM is xdem.dem.DEM
+assert coreg is xdem.coreg
+assert "DEM" in dir(xdem)
+
+try:
+    xdem.this_does_not_exist
+except AttributeError as exception:
+    assert "has no attribute 'this_does_not_exist'" in str(exception)
+else:
+    raise AssertionError("Expected an AttributeError")
+""")
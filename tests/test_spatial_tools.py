@@ -27,6 +27,28 @@ def test_dem_subtraction():
     assert np.nanmean(np.abs(diff.data)) < 100
 
 
+def test_nmad():
+    """Test that the NMAD is equal to its definition, also with NaNs, masked arrays and integers."""
+    data = np.random.normal(loc=3, scale=2, size=10000)
+    data[[5, 50, 500]] = np.nan
+
+    expected_nmad = 1.4826 * np.nanmedian(np.abs(data - np.nanmedian(data)))
+    assert abs(xdem.spatial_tools.nmad(data) - expected_nmad) < 1e-10
+
+    # Make sure that the input data are not modified.
+    assert np.count_nonzero(np.isnan(data)) == 3
+
+    masked_data = np.ma.masked_array(np.nan_to_num(data), mask=np.isnan(data))
+    assert abs(xdem.spatial_tools.nmad(masked_data) - expected_nmad) < 1e-10
+
+    assert xdem.spatial_tools.nmad(np.array([1, 2, 3, 4, 100])) == 1.4826
+
+    # The median should be returned alongside the NMAD when both are needed.
+    median, nmad = xdem.spatial_tools._median_and_nmad(data)
+    assert median == np.nanmedian(data)
+    assert nmad == xdem.spatial_tools.nmad(data)
+
+
 class TestMerging:
     """
     Test cases for stacking and merging DEMs
@@ -162,3 +162,25 @@ class TestLocalHypsometric:
         )
 
         assert custom_bins.shape[0] == quantile_bins.shape[0]
+
+    def test_geometry_coverage(self):
+        """Test that the coverage of all geometries equals the coverage calculated for each geometry in turn."""
+        mask = np.zeros((100, 100), dtype=int)
+        mask[:40, :40] = 1
+        mask[:40, 60:] = 4
+        mask[60:, :] = 7
+        inlier_mask = np.random.random(mask.shape) > 0.3
+        # Geometry 4 has no valid pixels at all, and there are valid pixels outside of the geometries.
+        inlier_mask[mask == 4] = False
+        inlier_mask[45:55] = True
+
+        geometry_index, coverage = xdem.volume._geometry_coverage(mask, inlier_mask)
+
+        expected_coverage = np.zeros(len(geometry_index))
+        for k, index in enumerate(np.unique(mask[mask != 0])):
+            expected_coverage[k] = np.count_nonzero(inlier_mask & (mask == index)) / np.count_nonzero(mask == index)
+
+        assert np.array_equal(geometry_index, [1, 4, 7])
+        assert np.array_equal(coverage, expected_coverage)
+        assert coverage[1] == 0
+        assert np.array_equal(geometry_index[coverage >= 0.2], [1, 7])
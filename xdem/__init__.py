@@ -1,4 +1,32 @@
-from . import coreg, dem, examples, spatial_tools, spstats, volume, filters
-from .ddem import dDEM
-from .dem import DEM
-from .demcollection import DEMCollection
+import importlib
+import typing
+
+# Submodules and classes are only imported when first accessed (PEP 562), as some have heavy dependencies.
+_submodules = ["coreg", "ddem", "dem", "demcollection", "examples", "filters", "spatial_tools", "spstats", "volume"]
+_classes = {"dDEM": "ddem", "DEM": "dem", "DEMCollection": "demcollection"}
+
+__all__ = _submodules + list(_classes)
+
+# Let static type checkers and IDEs resolve the lazily imported names.
+if typing.TYPE_CHECKING:
+    from . import coreg, ddem, dem, demcollection, examples, filters, spatial_tools, spstats, volume
+    from .ddem import dDEM
+    from .dem import DEM
+    from .demcollection import DEMCollection
+
+
+def __getattr__(name: str):
+    """Import a submodule or class the first time it is accessed."""
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _classes:
+        value = getattr(importlib.import_module(f".{_classes[name]}", __name__), name)
+        # Cache the class so that this function is not called again for it.
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -12,6 +12,7 @@ Date: 13 November 2020.
 from __future__ import annotations
 
 import json
+import math
 import os
 import subprocess
 import tempfile
@@ -54,6 +55,12 @@ try:
 except ImportError:
     _HAS_P3D = False
 
+try:
+    import numba
+    _has_numba = True
+except ImportError:
+    _has_numba = False
+
 
 def filter_by_range(ds: rio.DatasetReader, rangelim: tuple[float, float]):
     """
@@ -66,9 +73,17 @@ def filter_by_range(ds: rio.DatasetReader, rangelim: tuple[float, float]):
 
 
 def filtered_slope(ds_slope, slope_lim=(0.1, 40)):
+    """
+    Function to filter slope values using a range.
+    If the range covers 0-90 degrees, nothing can be filtered and ds_slope itself is returned (not a copy).
+    """
     print("Slope filter: %0.2f - %0.2f" % slope_lim)
     print("Initial count: %i" % ds_slope.count())
-    flt_slope = filter_by_range(ds_slope, slope_lim)
+    # Slopes in degrees are always within 0-90, so such limits would not filter anything.
+    if slope_lim[0] <= 0 and slope_lim[1] >= 90:
+        flt_slope = ds_slope
+    else:
+        flt_slope = filter_by_range(ds_slope, slope_lim)
     print(flt_slope.count())
     return flt_slope
 
@@ -113,9 +128,12 @@ def apply_z_shift(ds: rio.DatasetReader, dz: float):
     :param ds: DEM
     :param dx: dz shift value
     """
-    src_dem = rio.open(ds)
-    a = src_dem.read(1)
-    ds_shift = a + dz
+    with rio.open(ds) as src_dem:
+        ds_shift = np.empty(src_dem.shape, dtype=np.result_type(src_dem.dtypes[0], dz))
+        # Read the DEM block by block (following its internal tiling) and shift each block directly into the output.
+        for _, window in src_dem.block_windows(1):
+            np.add(src_dem.read(1, window=window), dz, out=ds_shift[window.toslices()])
+
     return ds_shift
 
 
@@ -167,15 +185,18 @@ def get_horizontal_shift(elevation_difference: np.ndarray, slope: np.ndarray, as
         input_y_values = elevation_difference / slope
 
     # Remove non-finite values
-    x_values = input_x_values[np.isfinite(input_x_values) & np.isfinite(input_y_values)]
-    y_values = input_y_values[np.isfinite(input_x_values) & np.isfinite(input_y_values)]
+    finite_mask = np.isfinite(input_x_values)
+    finite_mask &= np.isfinite(input_y_values)
+    x_values = input_x_values[finite_mask]
+    y_values = input_y_values[finite_mask]
 
     assert y_values.shape[0] > 0
 
-    # Remove outliers
-    lower_percentile = np.percentile(y_values, 1)
-    upper_percentile = np.percentile(y_values, 99)
-    valids = np.where((y_values > lower_percentile) & (y_values < upper_percentile) & (np.abs(y_values) < 200))
+    # Remove outliers. Both percentiles are found from the same partition, and the filters are combined in-place.
+    lower_percentile, upper_percentile = np.percentile(y_values, [1, 99])
+    valids = y_values > lower_percentile
+    valids &= y_values < upper_percentile
+    valids &= np.abs(y_values) < 200
     x_values = x_values[valids]
     y_values = y_values[valids]
 
@@ -251,6 +272,14 @@ def calculate_slope_and_aspect(dem: np.ndarray) -> tuple[np.ndarray, np.ndarray]
     # TODO: Figure out why slope is called slope_px. What unit is it in?
     # TODO: Change accordingly in the get_horizontal_shift docstring.
 
+    # Use the single-pass numba kernel if possible (np.gradient needs at least two values along each axis).
+    if _has_numba and dem.dtype in (np.float32, np.float64) and dem.ndim == 2 and min(dem.shape) > 1:
+        slope_px = np.empty_like(dem)
+        aspect = np.empty_like(dem)
+        _slope_and_aspect_kernel(dem, slope_px, aspect)
+
+        return slope_px, aspect
+
     # Calculate the gradient of the slope
     gradient_y, gradient_x = np.gradient(dem)
 
@@ -261,6 +290,35 @@ def calculate_slope_and_aspect(dem: np.ndarray) -> tuple[np.ndarray, np.ndarray]
     return slope_px, aspect
 
 
+if _has_numba:
+    # The compiled kernel is cached on disk (in __pycache__) to avoid the compilation cost in every new process.
+    @numba.njit(parallel=True, cache=True)
+    def _slope_and_aspect_kernel(dem: np.ndarray, slope_px: np.ndarray, aspect: np.ndarray):
+        """
+        Calculate the slope and aspect of a DEM in one pass, without allocating intermediate gradient arrays.
+
+        The gradients are identical to np.gradient: central differences in the interior and one-sided differences
+        along the edges.
+
+        :param dem: A 2D array of elevation values.
+        :param slope_px: The output slope array (same shape as the DEM).
+        :param aspect: The output aspect array (same shape as the DEM).
+        """
+        rows, cols = dem.shape
+        for row in numba.prange(rows):
+            row_above = max(row - 1, 0)
+            row_below = min(row + 1, rows - 1)
+            for col in range(cols):
+                col_left = max(col - 1, 0)
+                col_right = min(col + 1, cols - 1)
+
+                gradient_y = (dem[row_below, col] - dem[row_above, col]) / (row_below - row_above)
+                gradient_x = (dem[row, col_right] - dem[row, col_left]) / (col_right - col_left)
+
+                slope_px[row, col] = math.sqrt(gradient_x ** 2 + gradient_y ** 2)
+                aspect[row, col] = math.atan2(-gradient_x, gradient_y) + math.pi
+
+
 def deramping(elevation_difference, x_coordinates: np.ndarray, y_coordinates: np.ndarray,
               degree: int, verbose: bool = False,
               metadata: Optional[dict[str, Any]] = None) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
@@ -495,12 +553,9 @@ class Coreg:
                 subsample = int(np.count_nonzero(full_mask) * (1 - subsample))
 
             # Randomly pick N inliers in the full_mask where N=subsample
-            random_falses = np.random.choice(np.argwhere(full_mask.flatten()).squeeze(), int(subsample), replace=False)
-            # Convert the 1D indices to 2D indices
-            cols = (random_falses // full_mask.shape[0]).astype(int)
-            rows = random_falses % full_mask.shape[0]
+            random_falses = np.random.choice(np.flatnonzero(full_mask), int(subsample), replace=False)
             # Set the N random inliers to be parsed as outliers instead.
-            full_mask[rows, cols] = False
+            full_mask[np.unravel_index(random_falses, full_mask.shape)] = False
 
 
         # Run the associated fitting function
@@ -618,7 +673,10 @@ class Coreg:
         :returns: A 1D array of finite residuals.
         """
         # Use the transform to correct the DEM to be aligned.
-        aligned_dem = self.apply(dem_to_be_aligned, transform=transform)
+        # Masked arrays are converted to NaN-filled ndarrays to avoid the overhead of np.ma arithmetic below.
+        aligned_arr, aligned_mask = xdem.spatial_tools.get_array_and_mask(
+            self.apply(dem_to_be_aligned, transform=transform)
+        )
 
         # Format the reference DEM
         ref_arr, ref_mask = xdem.spatial_tools.get_array_and_mask(reference_dem)
@@ -627,10 +685,10 @@ class Coreg:
             inlier_mask = np.ones(ref_arr.shape, dtype=bool)
 
         # Create the full inlier mask (manual inliers plus non-nans)
-        full_mask = (~ref_mask) & np.isfinite(aligned_dem) & inlier_mask
+        full_mask = (~ref_mask) & (~aligned_mask) & inlier_mask
 
         # Calculate the DEM difference
-        diff = ref_arr - aligned_dem
+        diff = ref_arr - aligned_arr
 
         # Return the difference values within the full inlier mask
         return diff[full_mask]
@@ -1026,7 +1084,8 @@ class CoregPipeline(Coreg):
     def _fit_func(self, ref_dem: np.ndarray, tba_dem: np.ndarray, transform: Optional[rio.transform.Affine],
                   weights: Optional[np.ndarray], verbose: bool = False):
         """Fit each coregistration step with the previously transformed DEM."""
-        tba_dem_mod = tba_dem.copy()
+        # No copy is needed: the fit functions do not modify their inputs and .apply() returns a new array.
+        tba_dem_mod = tba_dem
 
         for i, coreg in enumerate(self.pipeline):
             if verbose:
@@ -1038,7 +1097,12 @@ class CoregPipeline(Coreg):
 
     def _apply_func(self, dem: np.ndarray, transform: rio.transform.Affine) -> np.ndarray:
         """Apply the coregistration steps sequentially to a DEM."""
-        dem_mod = dem.copy()
+        # Each step returns a new array, so the input DEM only needs to be copied if there are no steps.
+        # Otherwise, the returned array could be a view of the DEM given to .apply().
+        if len(self.pipeline) == 0:
+            return dem.copy()
+
+        dem_mod = dem
 
         for coreg in self.pipeline:
             dem_mod = coreg.apply(dem_mod, transform)
@@ -1143,8 +1207,7 @@ class NuthKaab(Coreg):
 
         # Calculate initial dDEM statistics
         elevation_difference = ref_dem - aligned_dem
-        bias = np.nanmedian(elevation_difference)
-        nmad_old = xdem.spatial_tools.nmad(elevation_difference)
+        bias, nmad_old = xdem.spatial_tools._median_and_nmad(elevation_difference)
         if verbose:
             print("   Statistics on initial dh:")
             print("      Median = {:.2f} - NMAD = {:.2f}".format(bias, nmad_old))
@@ -1157,10 +1220,8 @@ class NuthKaab(Coreg):
         pbar = trange(self.max_iterations, disable=not verbose, desc="   Progress")
         for i in pbar:
 
-            # Calculate the elevation difference and the residual (NMAD) between them.
-            elevation_difference = ref_dem - aligned_dem
-            bias = np.nanmedian(elevation_difference)
-            # Correct potential biases
+            # Correct potential biases. The elevation difference and its median are those of the current aligned_dem,
+            # calculated either before the loop or at the end of the previous iteration.
             elevation_difference -= bias
 
             # Estimate the horizontal shift from the implementation by Nuth and Kääb (2011)
@@ -1188,8 +1249,7 @@ class NuthKaab(Coreg):
 
             # Update statistics
             elevation_difference = ref_dem - aligned_dem
-            bias = np.nanmedian(elevation_difference)
-            nmad_new = xdem.spatial_tools.nmad(elevation_difference)
+            bias, nmad_new = xdem.spatial_tools._median_and_nmad(elevation_difference)
             nmad_gain = (nmad_new - nmad_old) / nmad_old*100
 
             if verbose:
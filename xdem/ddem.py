@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import copy
 import warnings
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 
+import geopandas as gpd
 import geoutils as gu
 import numpy as np
+import rasterio.features
 import shapely
+import shapely.ops
 
 import xdem
 
@@ -68,6 +71,46 @@ class dDEM(xdem.dem.DEM):   # pylint: disable=invalid-name
 
         self._filled_data = np.asarray(array).reshape(self.data.shape)
 
+    def _feature_masks(self, outlines: gpd.GeoDataFrame) -> Iterator[np.ndarray]:
+        """
+        Yield the mask of each feature in the outlines, in the order of first appearance.
+
+        Rows sharing the same index are treated as one feature. Features that do not overlap with any other feature
+        are rasterized together in one pass, and overlapping features are rasterized one by one.
+
+        :param outlines: The outlines of the features.
+        """
+        shape = self.data.shape[-2:]
+        indices, unions = [], []
+        for index, geometries in outlines.geometry.to_crs(self.crs).groupby(level=0, sort=False):
+            indices.append(index)
+            unions.append(shapely.ops.unary_union(geometries.values))
+        feature_geometries = gpd.GeoSeries(unions, index=indices, crs=self.crs)
+
+        # Overlapping features would lose pixels to each other in a shared raster, so they are flagged here.
+        # Features that only touch each other do not share any pixel.
+        overlapping = np.zeros(len(feature_geometries), dtype=bool)
+        spatial_index = feature_geometries.sindex
+        for k, geometry in enumerate(feature_geometries):
+            for other in spatial_index.query(geometry, predicate="intersects"):
+                if other != k and not geometry.touches(feature_geometries.iloc[other]):
+                    overlapping[k] = True
+                    break
+
+        # Rasterize all non-overlapping features in one pass, burning a unique id for each (0 means no feature).
+        feature_ids = np.zeros(shape, dtype="int32")
+        if np.any(~overlapping):
+            feature_ids = rasterio.features.rasterize(
+                [(geometry, k + 1) for k, geometry in enumerate(feature_geometries) if not overlapping[k]],
+                out_shape=shape, transform=self.transform, fill=0, dtype="int32"
+            )
+
+        for k, index in enumerate(feature_geometries.index):
+            if overlapping[k]:
+                yield gu.Vector(outlines.loc[outlines.index == index]).create_mask(self).reshape(shape)
+            else:
+                yield feature_ids == k + 1
+
     @property
     def fill_method(self) -> str:
         """Return the fill method used for the filled_data."""
@@ -112,6 +155,8 @@ class dDEM(xdem.dem.DEM):   # pylint: disable=invalid-name
 
         :param method: The method to use for interpolation.
         :param reference_elevation: Reference DEM. Only required for hypsometric approaches.
+        :param mask: Outlines of the features (e.g. glaciers) to interpolate. Only required for hypsometric approaches.
+            For the local approach, features sharing the same index are interpolated together.
         """
         if reference_elevation is not None:
             try:
@@ -141,9 +186,7 @@ class dDEM(xdem.dem.DEM):   # pylint: disable=invalid-name
             entries = mask.ds[mask.ds.intersects(shapely.geometry.box(*self.bounds))]
 
             ddem_mask = nans.copy().squeeze()
-            for i in entries.index:
-                feature_mask = (gu.Vector(entries.loc[entries.index == i]).create_mask(
-                    self)).reshape(interpolated_ddem.shape)
+            for feature_mask in self._feature_masks(entries):
                 if np.count_nonzero(feature_mask) == 0:
                     continue
                 try:
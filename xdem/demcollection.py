@@ -5,6 +5,7 @@ import datetime
 import warnings
 from typing import Optional, Union
 
+import geopandas as gpd
 import geoutils as gu
 import numpy as np
 import pandas as pd
@@ -65,6 +66,10 @@ class DEMCollection:
             raise ValueError(f"Invalid format on 'outlines': {type(outlines)},"
                              " expected one of ['gu.geovector.Vector', 'dict[datetime.datetime, gu.geovector.Vector']")
 
+        # Rasterized outlines, cached per timestamp, filter query, grid transform and shape.
+        # The outlines are stored along with the mask, to check that they have not been replaced since.
+        self._outline_masks: dict[tuple, tuple[gu.Vector, gpd.GeoDataFrame, np.ndarray]] = {}
+
     @property
     def reference_dem(self) -> gu.georaster.Raster:
         """Get the DEM acting reference."""
@@ -145,30 +150,50 @@ class DEMCollection:
         if not any(ddem is ddem_in_list for ddem_in_list in self.ddems):
             raise ValueError("Given dDEM must be a part of the DEMCollection object.")
 
-        if outlines_filter is None:
-            outlines = self.outlines
-        else:
-            outlines = {key: gu.Vector(outline.ds.copy()) for key, outline in self.outlines.items()}
-            for key in outlines:
-                outlines[key].ds = outlines[key].ds.query(outlines_filter)
-
         # If both the start and end time outlines exist, a mask is created from their union.
-        if ddem.start_time in outlines and ddem.end_time in outlines:
+        if ddem.start_time in self.outlines and ddem.end_time in self.outlines:
             mask = np.logical_or(
-                outlines[ddem.start_time].create_mask(ddem),
-                outlines[ddem.end_time].create_mask(ddem)
+                self._rasterize_outlines(ddem.start_time, ddem, outlines_filter=outlines_filter),
+                self._rasterize_outlines(ddem.end_time, ddem, outlines_filter=outlines_filter)
             )
         # If only start time outlines exist, these should be used as a mask
-        elif ddem.start_time in outlines:
-            mask = outlines[ddem.start_time].create_mask(ddem)
+        elif ddem.start_time in self.outlines:
+            mask = self._rasterize_outlines(ddem.start_time, ddem, outlines_filter=outlines_filter).copy()
         # If only one outlines file exist, use that as a mask.
-        elif len(outlines) == 1:
-            mask = list(outlines.values())[0].create_mask(ddem)
+        elif len(self.outlines) == 1:
+            mask = self._rasterize_outlines(list(self.outlines)[0], ddem, outlines_filter=outlines_filter).copy()
         # If no fitting outlines were found, make a full true boolean mask in its stead.
         else:
             mask = np.ones(shape=ddem.data.shape, dtype=bool)
         return mask.reshape(ddem.data.shape)
 
+    def _rasterize_outlines(self, timestamp: np.datetime64, ddem: xdem.dDEM,
+                            outlines_filter: Optional[str] = None) -> np.ndarray:
+        """
+        Rasterize the outlines of a timestamp on the grid of a dDEM.
+
+        All dDEMs of the collection usually share the same grid, so the mask is only rasterized once and then cached.
+        The mask is rasterized again if the outlines of the timestamp (or their GeoDataFrame) have been replaced.
+        Rows of the GeoDataFrame that are modified inplace are not detected.
+
+        :param timestamp: The timestamp of the outlines to rasterize.
+        :param ddem: The dDEM providing the grid to rasterize on.
+        :param outlines_filter: A query to filter the outline vectors. Example: "name_column == 'specific glacier'".
+
+        :returns: The (cached) boolean mask of the outlines. It should not be modified inplace.
+        """
+        outlines = self.outlines[timestamp]
+        key = (timestamp, outlines_filter, ddem.transform, ddem.data.shape)
+
+        cached = self._outline_masks.get(key)
+        # Keeping a reference to the cached outlines means that they cannot be garbage collected and mistaken for others.
+        if cached is None or cached[0] is not outlines or cached[1] is not outlines.ds:
+            filtered_outlines = gu.Vector(outlines.ds.query(outlines_filter)) if outlines_filter is not None else outlines
+            cached = (outlines, outlines.ds, filtered_outlines.create_mask(ddem))
+            self._outline_masks[key] = cached
+
+        return cached[2]
+
     def get_dh_series(self, outlines_filter: Optional[str] = None, mask: Optional[np.ndarray] = None,
                       nans_ok: bool = False) -> pd.DataFrame:
         """
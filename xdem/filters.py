@@ -136,8 +136,10 @@ pixels within a given radius.
     # Calculate the average value within the radius
     smooth = gaussian_filter_cv(array, sigma=radius)
 
-    # Filter outliers
-    outliers = (np.abs(array - smooth)) > outlier_threshold
+    # Filter outliers. The absolute difference is calculated in-place in the (newly allocated) smoothed array.
+    smooth -= array
+    np.abs(smooth, out=smooth)
+    outliers = smooth > outlier_threshold
     out_array = np.copy(array)
     out_array[outliers] = np.nan
 
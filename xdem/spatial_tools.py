@@ -68,20 +68,43 @@ def get_valid_extent(array: Union[np.ndarray, np.ma.masked_array]) -> tuple:
     return rows_nonzero[0], rows_nonzero[-1], cols_nonzero[0], cols_nonzero[-1]
 
 
-def nmad(data: np.ndarray, nfact: float = 1.4826) -> float:
+def _median_and_nmad(data: np.ndarray, nfact: float = 1.4826) -> tuple[float, float]:
     """
-    Calculate the normalized median absolute deviation (NMAD) of an array.
+    Calculate both the median and the NMAD of an array, reusing the median for the NMAD.
 
     :param data: input data
     :param nfact: normalization factor for the data; default is 1.4826
 
-    :returns nmad: (normalized) median absolute deviation of data.
+    :returns median, nmad: median and (normalized) median absolute deviation of data.
     """
     if isinstance(data, np.ma.masked_array):
         data_arr = get_array_and_mask(data, check_shape=False)[0]
     else:
         data_arr = np.asarray(data)
-    return nfact * np.nanmedian(np.abs(data_arr - np.nanmedian(data_arr)))
+
+    # Extract the valid values into a scratch array, which both medians are then allowed to partition in-place.
+    valid_values = data_arr[~np.isnan(data_arr)]
+    if not np.issubdtype(valid_values.dtype, np.floating):
+        valid_values = valid_values.astype(float)
+
+    median = np.median(valid_values, overwrite_input=True)
+    # The absolute deviations are calculated in the same scratch array (the order of the values does not matter).
+    valid_values -= median
+    np.abs(valid_values, out=valid_values)
+
+    return median, nfact * np.median(valid_values, overwrite_input=True)
+
+
+def nmad(data: np.ndarray, nfact: float = 1.4826) -> float:
+    """
+    Calculate the normalized median absolute deviation (NMAD) of an array.
+
+    :param data: input data
+    :param nfact: normalization factor for the data; default is 1.4826
+
+    :returns nmad: (normalized) median absolute deviation of data.
+    """
+    return _median_and_nmad(data, nfact=nfact)[1]
 
 
 def resampling_method_from_str(method_str: str) -> rio.warp.Resampling:
@@ -351,6 +351,26 @@ def hypsometric_interpolation(voided_ddem: Union[np.ndarray, np.ma.masked_array]
     return output
 
 
+def _geometry_coverage(mask: np.ndarray, inlier_mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the fraction of valid pixels of each geometry in a mask.
+
+    The pixels of all geometries are counted at once, instead of combining masks for each geometry.
+
+    :param mask: A raster with a different non-0 pixel value for each geometry.
+    :param inlier_mask: A boolean raster of valid pixels, with the same shape as mask.
+
+    :returns: The sorted geometry indexes and the coverage (0-1) of each.
+    """
+    geometry_index, total_pixels = np.unique(mask[mask != 0], return_counts=True)
+
+    inlier_index, inlier_pixels = np.unique(mask[inlier_mask & (mask != 0)], return_counts=True)
+    valid_pixels = np.zeros(len(geometry_index))
+    valid_pixels[np.searchsorted(geometry_index, inlier_index)] = inlier_pixels
+
+    return geometry_index, valid_pixels / total_pixels
+
+
 def local_hypsometric_interpolation(voided_ddem: Union[np.ndarray, np.ma.masked_array],
                                     ref_dem: Union[np.ndarray, np.ma.masked_array],
                                     mask: np.ndarray, min_coverage: float = 0.2,
@@ -400,18 +420,10 @@ for areas filling the min_coverage criterion.
         plt.title("inlier mask")
         plt.show()
 
-    # List of indexes to loop on
-    geometry_index = np.unique(mask[mask != 0])
+    # List of indexes to loop on, and the fraction of valid pixels for each geometry
+    geometry_index, coverage = _geometry_coverage(mask, inlier_mask)
     print("Found {:d} geometries".format(len(geometry_index)))
 
-    # Get fraction of valid pixels for each geometry
-    coverage = np.zeros(len(geometry_index))
-    for k, index in enumerate(geometry_index):
-        local_inlier_mask = inlier_mask & (mask == index)
-        total_pixels = np.count_nonzero((mask == index))
-        valid_pixels = np.count_nonzero(local_inlier_mask)
-        coverage[k] = valid_pixels/float(total_pixels)
-
     # Filter geometries with too little coverage
     valid_geometry_index = geometry_index[coverage >= min_coverage]
     print("Found {:d} geometries with sufficient coverage".format(len(valid_geometry_index)))